@@ -0,0 +1,645 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Python script to package the plugin into a reproducible release zip.
+
+Replaces the rsync + zip steps of the release workflow:
+- Files are selected with the same exclusion rules the rsync step used.
+- readme.txt is regenerated from README.md with ReadmeConverter.
+- Entries are written in sorted order with fixed timestamps and permissions,
+  so the same tree always produces the same bytes.
+- Entries are compressed in parallel, and files whose content hash matches
+  the previous artifact's manifest are copied from that zip without
+  recompressing them.
+- plugin-info.json is written next to the zip: update metadata in the
+  plugin-update-checker format, with the readme sections pre-rendered to
+  HTML, so sites can read one static file instead of the GitHub API.
+
+Usage:
+    python build-release.py --name usgs-stream-gage-data --version 1.2.8 \
+        --output build --previous build/previous/usgs-stream-gage-data-1.2.7.zip
+"""
+
+import os
+import re
+import html
+import json
+import time
+import zlib
+import struct
+import fnmatch
+import hashlib
+import argparse
+import importlib.util
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+# --- Configuration ---
+
+# Exclusion index, equivalent to the rsync rules previously used in release.yml:
+#   --exclude=".git*" --exclude="build" --exclude="node_modules" --exclude=".DS_Store"
+# Patterns without a slash match a file or directory name at any depth.
+EXCLUDE_PATTERNS = [
+    '.git*',
+    'build',
+    'node_modules',
+    '.DS_Store',
+]
+
+# Compression level for deflated entries (the level `zip` uses by default)
+COMPRESSION_LEVEL = 6
+
+# Timestamp for every entry when SOURCE_DATE_EPOCH is not set (earliest DOS date)
+DEFAULT_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+# Unix permissions stored for every entry
+FILE_MODE = 0o100644
+DIR_MODE = 0o040755
+
+# Path of the README converter, relative to this script
+CONVERTER_SCRIPT = 'python-converter.py'
+
+# File name of the precomputed update metadata written next to the zip
+PLUGIN_INFO_FILE = 'plugin-info.json'
+
+# Main plugin file header fields read for plugin-info.json
+PLUGIN_HEADERS = [
+    'Plugin Name',
+    'Plugin URI',
+    'Version',
+    'Author',
+    'Author URI',
+    'Requires at least',
+    'Requires PHP',
+    'Description',
+]
+
+# --- Helper Functions ---
+
+def is_excluded(name):
+    """
+    Check a single path component against the exclusion index.
+
+    Args:
+        name (str): A file or directory name (not a path).
+
+    Returns:
+        bool: True if the name matches any exclusion pattern.
+    """
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in EXCLUDE_PATTERNS)
+
+def collect_files(source_dir, skip_dir=None):
+    """
+    Walk the source tree and return the files to package.
+
+    Args:
+        source_dir (str): The plugin root directory.
+        skip_dir (str): A directory to leave out, e.g. the output directory.
+
+    Returns:
+        tuple: (sorted list of directory paths, sorted list of file paths),
+               both relative to source_dir and using '/' separators.
+    """
+    directories = []
+    files = []
+    for root, dirnames, filenames in os.walk(source_dir):
+        # Prune excluded directories so os.walk does not descend into them
+        dirnames[:] = [
+            d for d in dirnames
+            if not is_excluded(d) and os.path.abspath(os.path.join(root, d)) != skip_dir
+        ]
+        relative_root = os.path.relpath(root, source_dir).replace(os.sep, '/')
+        prefix = '' if relative_root == '.' else relative_root + '/'
+        for dirname in dirnames:
+            directories.append(prefix + dirname)
+        for filename in filenames:
+            if not is_excluded(filename):
+                files.append(prefix + filename)
+    return sorted(directories), sorted(files)
+
+def load_readme_converter():
+    """
+    Import ReadmeConverter from python-converter.py (not importable by name).
+
+    Returns:
+        type: The ReadmeConverter class.
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), CONVERTER_SCRIPT)
+    spec = importlib.util.spec_from_file_location('python_converter', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.ReadmeConverter
+
+def get_date_time():
+    """
+    Get the timestamp stored for every entry.
+
+    Honors SOURCE_DATE_EPOCH so a release can be pinned to its commit time.
+
+    Returns:
+        tuple: (year, month, day, hour, minute, second)
+    """
+    epoch = os.environ.get('SOURCE_DATE_EPOCH')
+    if not epoch:
+        return DEFAULT_DATE_TIME
+    moment = time.gmtime(int(epoch))
+    # DOS timestamps cannot represent anything before 1980
+    return max(DEFAULT_DATE_TIME, tuple(moment[:6]))
+
+def dos_date_time(date_time):
+    """
+    Pack a timestamp tuple into the DOS (time, date) pair used by zip headers.
+
+    Args:
+        date_time (tuple): (year, month, day, hour, minute, second)
+
+    Returns:
+        tuple: (dos_time, dos_date)
+    """
+    year, month, day, hour, minute, second = date_time
+    dos_time = (hour << 11) | (minute << 5) | (second // 2)
+    dos_date = ((year - 1980) << 9) | (month << 5) | day
+    return dos_time, dos_date
+
+def compress_entry(data, level):
+    """
+    Compress one file's content as a raw deflate stream.
+
+    Falls back to storing the data when deflating does not make it smaller.
+
+    Args:
+        data (bytes): The file content.
+        level (int): zlib compression level.
+
+    Returns:
+        tuple: (method, compressed bytes)
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    compressed = compressor.compress(data) + compressor.flush()
+    if len(compressed) >= len(data):
+        return zipfile.ZIP_STORED, data
+    return zipfile.ZIP_DEFLATED, compressed
+
+def read_raw_entries(zip_path):
+    """
+    Index the compressed streams of an existing zip without decompressing them.
+
+    Args:
+        zip_path (str): Path to a previous release artifact.
+
+    Returns:
+        dict: {path below the top-level directory: (method, crc, file size, compressed bytes)}
+    """
+    entries = {}
+    with zipfile.ZipFile(zip_path) as archive, open(zip_path, 'rb') as f:
+        for info in archive.infolist():
+            if info.is_dir() or info.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+                continue
+            # The local header repeats the name and may have its own extra field
+            f.seek(info.header_offset)
+            header = f.read(30)
+            name_length, extra_length = struct.unpack('<HH', header[26:30])
+            f.seek(info.header_offset + 30 + name_length + extra_length)
+            path = info.filename.split('/', 1)[-1]
+            entries[path] = (
+                info.compress_type,
+                info.CRC,
+                info.file_size,
+                f.read(info.compress_size),
+            )
+    return entries
+
+def read_plugin_header(source_dir):
+    """
+    Read the header fields (Plugin Name, Version, ...) of the main plugin file.
+
+    Works like WordPress get_file_data(): only the fields in PLUGIN_HEADERS
+    are read, the first match of each wins, and the search stops at the end
+    of the first comment block.
+
+    Args:
+        source_dir (str): The plugin root directory.
+
+    Returns:
+        dict: Header field name -> value; empty if no main plugin file is found.
+    """
+    for filename in sorted(os.listdir(source_dir)):
+        if not filename.endswith('.php'):
+            continue
+        with open(os.path.join(source_dir, filename), 'r', encoding='utf-8') as f:
+            # WordPress only looks at the first 8 KiB for the header
+            header = f.read(8192)
+        comment_end = header.find('*/')
+        if comment_end != -1:
+            header = header[:comment_end]
+
+        fields = {}
+        for field in PLUGIN_HEADERS:
+            match = re.search(
+                r'^(?:[ \t]*<\?php)?[ \t/*#@]*' + re.escape(field) + r':(.*)$',
+                header, re.MULTILINE | re.IGNORECASE
+            )
+            if match and match.group(1).strip():
+                fields[field] = match.group(1).strip()
+        if 'Plugin Name' in fields:
+            return fields
+    return {}
+
+def format_inline_html(text):
+    """
+    Convert inline readme.txt markup (bold, emphasis, links) to HTML.
+
+    Args:
+        text (str): A single line of readme.txt content.
+
+    Returns:
+        str: Escaped HTML.
+    """
+    # Escape once, quotes included, so link URLs are safe inside href="..."
+    text = html.escape(text, quote=True)
+    text = re.sub(
+        r'\[([^\]]+)\]\(([^)\s]+)\)',
+        r'<a href="\2">\1</a>',
+        text
+    )
+    text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
+    text = re.sub(r'(?<![\w*])\*(?!\s)(.+?)(?<!\s)\*(?![\w*])', r'<em>\1</em>', text)
+    return text
+
+def render_section_html(content):
+    """
+    Render one formatted readme.txt section to HTML.
+
+    Handles what ReadmeConverter emits: '= Heading =' lines, '* ' and '1. '
+    lists, and paragraphs separated by blank lines.
+
+    Args:
+        content (str): Section content as stored in ReadmeConverter.plugin_sections.
+
+    Returns:
+        str: The section HTML.
+    """
+    output = []
+    paragraph = []
+    list_tag = None
+
+    def close_blocks():
+        nonlocal list_tag
+        if paragraph:
+            output.append('<p>' + '<br>\n'.join(paragraph) + '</p>')
+            paragraph.clear()
+        if list_tag:
+            output.append(f'</{list_tag}>')
+            list_tag = None
+
+    for line in content.splitlines():
+        stripped = line.strip()
+        heading = re.match(r'^=+\s*(.*?)\s*=+$', stripped)
+        item = re.match(r'^(?:([*+-])|\d+\.)\s+(.*)$', stripped)
+
+        if not stripped:
+            close_blocks()
+        elif heading:
+            close_blocks()
+            output.append(f'<h4>{format_inline_html(heading.group(1))}</h4>')
+        elif item:
+            tag = 'ul' if item.group(1) else 'ol'
+            if paragraph or list_tag != tag:
+                close_blocks()
+                output.append(f'<{tag}>')
+                list_tag = tag
+            output.append(f'<li>{format_inline_html(item.group(2))}</li>')
+        else:
+            if list_tag:
+                close_blocks()
+            paragraph.append(format_inline_html(stripped))
+
+    close_blocks()
+    return "\n".join(output)
+
+def manifest_path_for(zip_path):
+    """Return the content-hash manifest path that accompanies a zip."""
+    return re.sub(r'\.zip$', '', zip_path) + '.manifest.json'
+
+# --- Zip Writer ---
+
+class ReproducibleZipWriter:
+    """Writes pre-compressed entries into a zip with fixed metadata."""
+
+    def __init__(self, fileobj, date_time):
+        """
+        Initialize the writer.
+
+        Args:
+            fileobj: A binary file object opened for writing.
+            date_time (tuple): Timestamp stored for every entry.
+        """
+        self.fileobj = fileobj
+        self.dos_time, self.dos_date = dos_date_time(date_time)
+        self.central_directory = []
+        self.offset = 0
+
+    def write_entry(self, name, method, crc, file_size, data, mode):
+        """
+        Append one entry (local header + data) and remember its directory record.
+
+        Args:
+            name (str): Entry name inside the zip.
+            method (int): zipfile.ZIP_STORED or zipfile.ZIP_DEFLATED.
+            crc (int): CRC-32 of the uncompressed content.
+            file_size (int): Uncompressed size.
+            data (bytes): The (possibly compressed) entry data.
+            mode (int): Unix mode bits for the external attributes.
+        """
+        if self.offset + len(data) > 0xFFFFFFFF:
+            raise IOError("Release archive would exceed the 4 GiB zip limit")
+
+        encoded_name = name.encode('utf-8')
+        flags = 0 if encoded_name.isascii() else 0x800  # UTF-8 file name
+        version = 20 if method == zipfile.ZIP_DEFLATED or name.endswith('/') else 10
+
+        local_header = struct.pack(
+            '<IHHHHHIIIHH',
+            0x04034b50, version, flags, method, self.dos_time, self.dos_date,
+            crc, len(data), file_size, len(encoded_name), 0
+        )
+        self.central_directory.append(struct.pack(
+            '<IHHHHHHIIIHHHHHII',
+            0x02014b50, (3 << 8) | version, version, flags, method,
+            self.dos_time, self.dos_date, crc, len(data), file_size,
+            len(encoded_name), 0, 0, 0, 0, mode << 16, self.offset
+        ) + encoded_name)
+
+        self.fileobj.write(local_header)
+        self.fileobj.write(encoded_name)
+        self.fileobj.write(data)
+        self.offset += len(local_header) + len(encoded_name) + len(data)
+
+    def close(self):
+        """Write the central directory and end-of-central-directory record."""
+        directory_offset = self.offset
+        directory = b''.join(self.central_directory)
+        self.fileobj.write(directory)
+        self.fileobj.write(struct.pack(
+            '<IHHHHIIH',
+            0x06054b50, 0, 0, len(self.central_directory), len(self.central_directory),
+            len(directory), directory_offset, 0
+        ))
+
+# --- Core Packaging Class/Logic ---
+
+class ReleasePackager:
+    """Builds the release zip and its content-hash manifest."""
+
+    def __init__(self, source_dir, package_name, previous_zip=None, jobs=None):
+        """
+        Initialize the packager.
+
+        Args:
+            source_dir (str): The plugin root directory.
+            package_name (str): Top-level directory name inside the zip.
+            previous_zip (str): Previous release artifact to reuse entries from.
+            jobs (int): Number of parallel compression workers.
+        """
+        self.source_dir = source_dir
+        self.package_name = package_name
+        self.previous_zip = previous_zip
+        self.jobs = jobs or os.cpu_count() or 1
+        self.converter = None
+        self.reused = 0
+        self.compressed = 0
+
+    def read_contents(self, files):
+        """
+        Read every file to package, regenerating readme.txt on the way.
+
+        Args:
+            files (list): Relative file paths from collect_files().
+
+        Returns:
+            dict: {relative path: bytes}
+        """
+        contents = {}
+        for path in files:
+            with open(os.path.join(self.source_dir, path), 'rb') as f:
+                contents[path] = f.read()
+
+        if 'README.md' in contents:
+            ReadmeConverter = load_readme_converter()
+            markdown_content = contents['README.md'].decode('utf-8')
+            # Keep the converter: build_plugin_info() reuses its parsed metadata
+            self.converter = ReadmeConverter(markdown_content)
+            contents['readme.txt'] = self.converter.convert().encode('utf-8')
+        return contents
+
+    def load_previous(self):
+        """
+        Load the previous artifact's manifest and raw entries, if usable.
+
+        Returns:
+            tuple: (manifest files dict, raw entries dict); both empty if unavailable.
+        """
+        if not self.previous_zip or not os.path.isfile(self.previous_zip):
+            return {}, {}
+        try:
+            with open(manifest_path_for(self.previous_zip), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}, {}
+        # Deflate output depends on the zlib build as well as the level
+        if manifest.get('level') != COMPRESSION_LEVEL or manifest.get('zlib') != zlib.ZLIB_RUNTIME_VERSION:
+            return {}, {}
+        return manifest.get('files', {}), read_raw_entries(self.previous_zip)
+
+    def build(self, zip_path):
+        """
+        Write the release zip and its manifest.
+
+        Args:
+            zip_path (str): Destination path of the zip.
+
+        Returns:
+            dict: The manifest that was written next to the zip.
+        """
+        output_dir = os.path.dirname(os.path.abspath(zip_path))
+        directories, files = collect_files(self.source_dir, skip_dir=output_dir)
+        contents = self.read_contents(files)
+        if 'readme.txt' not in files and 'readme.txt' in contents:
+            files = sorted(files + ['readme.txt'])
+
+        previous_files, previous_entries = self.load_previous()
+
+        hashes = {path: hashlib.sha256(contents[path]).hexdigest() for path in files}
+
+        # Decide per file whether the previous compressed stream can be reused
+        entries = {}
+        to_compress = []
+        for path in files:
+            previous = previous_files.get(path)
+            raw = previous_entries.get(path)
+            if raw and previous and previous.get('sha256') == hashes[path]:
+                entries[path] = raw
+                self.reused += 1
+            else:
+                to_compress.append(path)
+
+        def compress(path):
+            data = contents[path]
+            method, compressed = compress_entry(data, COMPRESSION_LEVEL)
+            return path, (method, zlib.crc32(data), len(data), compressed)
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            for path, entry in executor.map(compress, to_compress):
+                entries[path] = entry
+                self.compressed += 1
+
+        # Directory entries and files, in one sorted order
+        names = [(f"{self.package_name}/", None)]
+        names += [(f"{self.package_name}/{d}/", None) for d in directories]
+        names += [(f"{self.package_name}/{p}", p) for p in files]
+        names.sort(key=lambda item: item[0])
+
+        temp_path = zip_path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            writer = ReproducibleZipWriter(f, get_date_time())
+            for name, path in names:
+                if path is None:
+                    writer.write_entry(name, zipfile.ZIP_STORED, 0, 0, b'', DIR_MODE)
+                else:
+                    method, crc, size, data = entries[path]
+                    writer.write_entry(name, method, crc, size, data, FILE_MODE)
+            writer.close()
+        os.replace(temp_path, zip_path)
+
+        manifest = {
+            'level': COMPRESSION_LEVEL,
+            'zlib': zlib.ZLIB_RUNTIME_VERSION,
+            'files': {path: {'sha256': hashes[path], 'size': len(contents[path])} for path in files},
+        }
+        with open(manifest_path_for(zip_path), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+            f.write("\n")
+        return manifest
+
+    def build_plugin_info(self, version, download_url=None):
+        """
+        Build the update metadata from the README parsed during build().
+
+        Args:
+            version (str): Release version.
+            download_url (str): Public URL of the release zip.
+
+        Returns:
+            dict: Metadata in the plugin-update-checker JSON format.
+        """
+        header = read_plugin_header(self.source_dir)
+        meta = self.converter.plugin_meta if self.converter else {}
+        sections = self.converter.plugin_sections if self.converter else {}
+
+        info = {
+            'name': header.get('Plugin Name') or meta.get('name') or self.package_name,
+            'slug': self.package_name,
+            'version': version,
+            'homepage': header.get('Plugin URI', ''),
+            'author': header.get('Author') or meta.get('author', ''),
+            'author_homepage': header.get('Author URI') or meta.get('author_uri', ''),
+            'requires': header.get('Requires at least') or meta.get('requires', ''),
+            'tested': meta.get('tested', ''),
+            'requires_php': header.get('Requires PHP') or meta.get('requires_php', ''),
+            'sections': {},
+        }
+        if download_url:
+            info['download_url'] = download_url
+        if os.environ.get('SOURCE_DATE_EPOCH'):
+            info['last_updated'] = time.strftime('%Y-%m-%d %H:%M:%S', get_date_time() + (0, 0, -1))
+
+        for section_key, content in sections.items():
+            if not content.strip():
+                continue
+            if section_key == 'upgrade_notice':
+                # Shown on its own in the update row, not as a tab
+                info['upgrade_notice'] = render_section_html(content)
+            else:
+                info['sections'][section_key] = render_section_html(content)
+        if 'description' not in info['sections'] and header.get('Description'):
+            info['sections']['description'] = '<p>' + html.escape(header['Description'], quote=False) + '</p>'
+
+        return info
+
+# --- Main Execution ---
+
+def main():
+    """Main function to handle script execution and arguments."""
+    parser = argparse.ArgumentParser(
+        description="Package the plugin into a reproducible release zip.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument(
+        "-s", "--source",
+        default=".",
+        help="Path to the plugin root directory."
+    )
+    parser.add_argument(
+        "-n", "--name",
+        required=True,
+        help="Plugin directory name inside the zip (usually the repository name)."
+    )
+    parser.add_argument(
+        "-v", "--version",
+        required=True,
+        help="Release version, used in the zip file name."
+    )
+    parser.add_argument(
+        "-o", "--output",
+        default="build",
+        help="Directory to write the zip and its manifest to."
+    )
+    parser.add_argument(
+        "-p", "--previous",
+        help="Previous release zip; unchanged files are copied from it without recompressing."
+    )
+    parser.add_argument(
+        "-u", "--download-url",
+        help="Public URL of the release zip, recorded in plugin-info.json."
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=None,
+        help="Number of parallel compression workers (defaults to the CPU count)."
+    )
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.source):
+        print(f"Error: Source directory not found at '{args.source}'")
+        return 1
+
+    zip_path = os.path.join(args.output, f"{args.name}-{args.version}.zip")
+
+    try:
+        os.makedirs(args.output, exist_ok=True)
+        packager = ReleasePackager(args.source, args.name, args.previous, args.jobs)
+        manifest = packager.build(zip_path)
+
+        info = packager.build_plugin_info(args.version, args.download_url)
+        with open(os.path.join(args.output, PLUGIN_INFO_FILE), 'w', encoding='utf-8') as f:
+            json.dump(info, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+
+        print(
+            f"Successfully packaged {len(manifest['files'])} files into '{zip_path}' "
+            f"({packager.reused} reused, {packager.compressed} compressed)"
+        )
+        return 0
+
+    except IOError as e:
+        print(f"Error writing release archive '{zip_path}': {e}")
+        return 1
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+        return 1
+
+if __name__ == "__main__":
+    exit_code = main()
+    exit(exit_code)
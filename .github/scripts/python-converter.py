@@ -7,10 +7,12 @@ into a WordPress plugin repository-compatible readme.txt file.
 
 Usage:
     python convert_readme.py --input README.md --output readme.txt
+    python convert_readme.py --input README.md --output readme.txt --check
 """
 
 import re
 import argparse
+import difflib
 import os
 from collections import OrderedDict
 
@@ -645,17 +647,23 @@ class ReadmeConverter:
         return "\n".join(header_lines) + "\n" # Add trailing newline
 
 
-    def build_sections(self):
-        """Build all sections of the WordPress readme.txt"""
-        section_content_lines = []
-        # Add each non-empty section in the defined order
+    def iter_sections(self):
+        """
+        Yield each non-empty section of the WordPress readme.txt in order.
+
+        Yields:
+            tuple: (section title, section text including its '== Title ==' line)
+        """
         for section_key in SECTION_ORDER:
             content = self.plugin_sections.get(section_key, "").strip()
             if content:
                 # Use the standard title, fallback to key if somehow missing
                 title = SECTION_TITLES.get(section_key, section_key.replace('_', ' ').title())
-                section_content_lines.append(f"== {title} ==\n\n{content}")
+                yield title, f"== {title} ==\n\n{content}"
 
+    def build_sections(self):
+        """Build all sections of the WordPress readme.txt"""
+        section_content_lines = [text for _, text in self.iter_sections()]
         return "\n\n".join(section_content_lines) + "\n" # Add trailing newline
 
 
@@ -673,9 +681,97 @@ class ReadmeConverter:
         self.wordpress_content = header + "\n" + sections # Add extra newline between header and first section
         return self.wordpress_content.strip() + "\n" # Ensure single trailing newline
 
+    def iter_blocks(self):
+        """
+        Yield the readme.txt in blocks, parsing only as much as each block needs.
+
+        The blocks joined with blank lines (plus a trailing newline) equal the
+        output of convert(). The header is yielded before the sections are
+        parsed, so a caller that stops early skips that work.
+
+        Yields:
+            tuple: (block title, block text)
+        """
+        if not self.github_content:
+            return
+
+        self.parse_metadata()
+        yield 'Header', self.build_header().strip()
+
+        self.parse_sections()
+        yield from self.iter_sections()
+
+    def check(self, existing_content):
+        """
+        Compare an existing readme.txt against the conversion, block by block.
+
+        Stops at the first block that differs.
+
+        Args:
+            existing_content (str): The current readme.txt content.
+
+        Returns:
+            tuple: (title of the first differing block or None if in sync,
+                    existing text of that block, expected text of that block)
+        """
+        existing = existing_content.replace("\r\n", "\n").replace("\r", "\n")
+        offset = 0
+
+        for title, expected in self.iter_blocks():
+            separator = "\n\n" if offset else ""
+            end = offset + len(separator) + len(expected)
+            # The block must also end there: next block or the final newline
+            if existing.startswith(separator + expected, offset) and (
+                    existing.startswith("\n\n", end) or existing[end:] == "\n"):
+                offset = end
+                continue
+            # Show the existing block up to the next section heading
+            start = offset + len(separator) if existing.startswith(separator, offset) else offset
+            end = existing.find("\n\n== ", start)
+            return title, existing[start:end if end != -1 else len(existing)].rstrip("\n"), expected
+
+        # Anything left over besides the trailing newline is an extra section
+        # (convert() returns '' for an empty README, with no trailing newline)
+        if existing[offset:] != ("\n" if offset else ""):
+            return 'End of file', existing[offset:].strip("\n"), ''
+        return None, '', ''
+
 
 # --- Main Execution ---
 
+def check_output(converter, output_file):
+    """
+    Check an existing readme.txt against the conversion without writing to it.
+
+    Args:
+        converter (ReadmeConverter): Converter for the input README.md.
+        output_file (str): Path to the readme.txt to check.
+
+    Returns:
+        int: 0 if the file is up to date, 1 otherwise.
+    """
+    try:
+        with open(output_file, 'r', encoding='utf-8') as f:
+            existing_content = f.read()
+    except FileNotFoundError:
+        print(f"'{output_file}' does not exist")
+        return 1
+
+    title, existing, expected = converter.check(existing_content)
+    if title is None:
+        print(f"'{output_file}' is up to date")
+        return 0
+
+    print(f"'{output_file}' is out of date: '{title}' differs")
+    diff = difflib.unified_diff(
+        existing.splitlines(), expected.splitlines(),
+        fromfile=f"{output_file} ({title})", tofile=f"expected ({title})",
+        n=1, lineterm=''
+    )
+    for line in diff:
+        print(line)
+    return 1
+
 def main():
     """Main function to handle script execution and arguments."""
     parser = argparse.ArgumentParser(
@@ -692,6 +788,11 @@ def main():
         required=True,
         help="Path to the output readme.txt file."
     )
+    parser.add_argument(
+        "-c", "--check",
+        action="store_true",
+        help="Only check that the output file is up to date; never writes. Exits 1 if it differs."
+    )
     args = parser.parse_args()
 
     input_file = args.input
@@ -707,8 +808,12 @@ def main():
         with open(input_file, 'r', encoding='utf-8') as f:
             markdown_content = f.read()
 
-        # Perform the conversion
         converter = ReadmeConverter(markdown_content)
+
+        if args.check:
+            return check_output(converter, output_file)
+
+        # Perform the conversion
         readme_txt_content = converter.convert()
 
         # Write the output file (assume UTF-8)
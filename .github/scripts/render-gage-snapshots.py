@@ -0,0 +1,755 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Python script to pre-render the [usgs_stream_gage] shortcode output for every
+configured gage into static HTML fragments, so pages can include a file instead
+of calling the USGS services while the page is being built.
+
+The site list is the value of the plugin's `usgs_stream_gage_sites` option,
+exported as JSON, e.g.:
+
+    wp option get usgs_stream_gage_sites --format=json > sites.json
+
+For each site id two files are written to the output directory:
+
+    <id>.html   The same markup render_shortcode() produces with default attributes.
+    <id>.json   Sidecar with the readings used and a fingerprint of them.
+
+Dates are formatted like the plugin does, but from options given on the
+command line rather than read from WordPress: pass the site's date_format,
+time_format and timezone_string (or UTC offset) with --date-format,
+--time-format and --timezone. Without --timezone, times are shown in the
+gage's own UTC offset as reported by USGS. Month and day names are always
+English. "As of" is the time of the latest reading, not the time of the fetch.
+
+Usage:
+    python render-gage-snapshots.py --sites sites.json --output snapshots/
+"""
+
+import re
+import json
+import html
+import hashlib
+import argparse
+import os
+import tempfile
+import urllib.parse
+import urllib.request
+from datetime import date, datetime, timedelta, timezone
+
+# --- Configuration ---
+
+# Base URL for USGS Instantaneous Values service
+USGS_IV_SERVICE_URL = 'https://waterservices.usgs.gov/nwis/iv/'
+
+# Parameter codes requested from the IV service
+DISCHARGE_CODE = '00060'
+GAGE_HEIGHT_CODE = '00065'
+
+# Site numbers per request. Each request covers a year of 15-minute readings
+# (~35k per parameter per site), so batches stay small to bound the response
+# size and keep one failed request from taking many sites down with it.
+SITES_PER_REQUEST = 10
+
+# Historical periods in the order the shortcode shows them
+PERIODS = ['24h', '7d', '30d', '1y']
+
+# Human-readable labels, as in USGS_Stream_Gage_Shortcode::get_period_label()
+PERIOD_LABELS = {
+    '24h': 'Last 24 Hours',
+    '7d': 'Last 7 Days',
+    '30d': 'Last 30 Days',
+    '1y': 'Last Year',
+}
+
+# WordPress default date_format and time_format options, used by
+# USGS_Stream_Gage_API::format_date() for the high/low date cells
+DEFAULT_DATE_FORMAT = 'F j, Y'
+DEFAULT_TIME_FORMAT = 'g:i a'
+
+# Fixed PHP date() format render_shortcode() uses for "As of"
+AS_OF_FORMAT = 'F j, Y g:i a'
+
+# Responsive table styles emitted inline by render_shortcode()
+RESPONSIVE_STYLE = '''<style>
+            /* Responsive styles for USGS Stream Gage data tables */
+            @media screen and (max-width: 768px) {
+                .usgs-historical-table {
+                    width: 100%;
+                }
+                .usgs-historical-table thead {
+                    display: none;
+                }
+                .usgs-historical-table tr {
+                    display: block;
+                    margin-bottom: 1.5em;
+                    border-bottom: 2px solid #ddd;
+                }
+                .usgs-historical-table td {
+                    display: flex;
+                    justify-content: space-between;
+                    padding: 6px 8px;
+                    text-align: right;
+                    border-bottom: 1px solid #eee;
+                }
+                .usgs-historical-table td:before {
+                    content: attr(data-label);
+                    font-weight: bold;
+                    float: left;
+                    text-align: left;
+                }
+                .usgs-high, .usgs-low {
+                    flex-direction: column;
+                    align-items: flex-end;
+                }
+                .usgs-datetime {
+                    font-size: 0.9em;
+                    color: #666;
+                    margin-top: 4px;
+                }
+            }
+        </style>'''
+
+# Tab switching script emitted inline by render_shortcode(); {id} is the site id
+TAB_SCRIPT = '''<script>
+                document.addEventListener("DOMContentLoaded", function() {
+                    // Get all tab buttons and tab content divs
+                    var tabButtons = document.querySelectorAll("#usgs-stream-gage-{id} .usgs-period-tab");
+                    var tabContents = document.querySelectorAll("#usgs-stream-gage-{id} .usgs-period-data");
+
+                    // Add click event listeners to tab buttons
+                    tabButtons.forEach(function(button) {
+                        button.addEventListener("click", function() {
+                            var period = this.getAttribute("data-period");
+
+                            // Deactivate all tabs
+                            tabButtons.forEach(function(btn) {
+                                btn.classList.remove("active");
+                            });
+
+                            // Hide all tab contents
+                            tabContents.forEach(function(content) {
+                                content.style.display = "none";
+                            });
+
+                            // Activate selected tab
+                            this.classList.add("active");
+
+                            // Show selected tab content
+                            document.querySelector("#usgs-stream-gage-{id} .usgs-period-data[data-period='" + period + "']").style.display = "block";
+                        });
+                    });
+                });
+            </script>'''
+
+# --- Helper Functions ---
+
+def esc(value):
+    """
+    Escape a value for HTML output, like WordPress esc_html()/esc_attr().
+
+    Args:
+        value: Any value; None renders as an empty string.
+
+    Returns:
+        str: The escaped string.
+    """
+    if value is None:
+        return ''
+    return html.escape(str(value), quote=True)
+
+def php_empty(value):
+    """
+    Check a value the way PHP empty() does for the types USGS data uses.
+
+    USGS readings are strings, and PHP treats "0" as empty, so a zero
+    reading hides its row in render_shortcode().
+
+    Args:
+        value: A string, number or None.
+
+    Returns:
+        bool: True for None, '', '0' and zero.
+    """
+    return value is None or value == '' or value == '0' or value == 0
+
+def php_number(value):
+    """
+    Render a float the way PHP echoes it (1234.0 -> "1234", 3.5 -> "3.5").
+
+    Args:
+        value (float): The number.
+
+    Returns:
+        str: The PHP-style string representation.
+    """
+    if value is None:
+        return ''
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+def php_date(date_format, moment):
+    """
+    Format a datetime with a PHP date() format string.
+
+    Supports the day, month, year and time characters WordPress date and
+    time formats use; backslash escapes a character. Month and day names
+    are English (date_i18n() would translate them).
+
+    Args:
+        date_format (str): PHP date() format, e.g. 'F j, Y g:i a'.
+        moment (datetime): The moment to format.
+
+    Returns:
+        str: The formatted date.
+    """
+    replacements = {
+        'd': f"{moment.day:02d}",
+        'D': moment.strftime('%a'),
+        'j': str(moment.day),
+        'l': moment.strftime('%A'),
+        'N': str(moment.isoweekday()),
+        'S': 'th' if 10 <= moment.day % 100 <= 20 else {1: 'st', 2: 'nd', 3: 'rd'}.get(moment.day % 10, 'th'),
+        'w': str(moment.isoweekday() % 7),
+        'F': moment.strftime('%B'),
+        'M': moment.strftime('%b'),
+        'm': f"{moment.month:02d}",
+        'n': str(moment.month),
+        'Y': str(moment.year),
+        'y': f"{moment.year % 100:02d}",
+        'a': 'am' if moment.hour < 12 else 'pm',
+        'A': 'AM' if moment.hour < 12 else 'PM',
+        'g': str(moment.hour % 12 or 12),
+        'G': str(moment.hour),
+        'h': f"{moment.hour % 12 or 12:02d}",
+        'H': f"{moment.hour:02d}",
+        'i': f"{moment.minute:02d}",
+        's': f"{moment.second:02d}",
+        'T': moment.tzname() or '',
+        'P': moment.strftime('%z')[:3] + ':' + moment.strftime('%z')[3:] if moment.tzinfo else '',
+    }
+    output = []
+    escaped = False
+    for char in date_format:
+        if escaped:
+            output.append(char)
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        else:
+            output.append(replacements.get(char, char))
+    return ''.join(output)
+
+def parse_timezone(name):
+    """
+    Resolve a WordPress timezone setting to a tzinfo.
+
+    Args:
+        name (str): An IANA name ('America/Denver'), 'UTC', or an offset
+                    like '-07:00' / 'UTC-7' (WordPress gmt_offset style).
+
+    Returns:
+        tzinfo: The timezone.
+
+    Raises:
+        ValueError: If the name cannot be resolved.
+    """
+    match = re.match(r'^(?:UTC)?([+-])(\d{1,2})(?::?(\d{2}))?$', name)
+    if match:
+        offset = timedelta(hours=int(match.group(2)), minutes=int(match.group(3) or 0))
+        return timezone(-offset if match.group(1) == '-' else offset)
+    if name.upper() == 'UTC':
+        return timezone.utc
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(name)
+    except Exception as e:
+        raise ValueError(f"Unknown timezone '{name}'") from e
+
+def format_datetime(date_string, date_format, tz=None):
+    """
+    Format a USGS ISO date string like USGS_Stream_Gage_API::format_date().
+
+    Args:
+        date_string (str): ISO date string from the USGS API.
+        date_format (str): PHP date() format to use.
+        tz (tzinfo): Timezone to show the time in; None keeps the gage's own
+                     UTC offset from the reading.
+
+    Returns:
+        str: Formatted date, or '' if the string is empty or unparsable.
+    """
+    if not date_string:
+        return ''
+    try:
+        moment = datetime.fromisoformat(date_string)
+    except ValueError:
+        return ''
+    if tz is not None and moment.tzinfo is not None:
+        moment = moment.astimezone(tz)
+    return php_date(date_format, moment)
+
+def period_start_date(period, today):
+    """
+    Get the first calendar date covered by a period.
+
+    Mirrors get_historical_data(), which sends startDT as a Y-m-d date, so a
+    period starts at midnight of the day its relative offset falls on.
+
+    Args:
+        period (str): The period code ('24h', '7d', '30d', '1y').
+        today (date): The end date of the period.
+
+    Returns:
+        date: The start date.
+    """
+    if period == '24h':
+        return today - timedelta(days=1)
+    if period == '7d':
+        return today - timedelta(days=7)
+    if period == '30d':
+        return today - timedelta(days=30)
+    # '1y': strtotime('-1 year') rolls Feb 29 over to Mar 1
+    try:
+        return today.replace(year=today.year - 1)
+    except ValueError:
+        return date(today.year - 1, 3, 1)
+
+def write_atomic(path, content):
+    """
+    Write a file so readers only ever see the old or the complete new content.
+
+    Args:
+        path (str): Destination path.
+        content (str): Text to write (UTF-8).
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+# --- Data Functions ---
+
+def fetch_series(site_numbers, today):
+    """
+    Fetch one year of discharge and gage height readings for many sites at once.
+
+    Args:
+        site_numbers (list): USGS site numbers (at most SITES_PER_REQUEST).
+        today (date): The end date of the requested window.
+
+    Returns:
+        dict: {site_number: {parameter_code: {'unit': str, 'values': list}}}
+    """
+    args = {
+        'format': 'json',
+        'sites': ','.join(site_numbers),
+        'startDT': period_start_date('1y', today).isoformat(),
+        'endDT': today.isoformat(),
+        'parameterCd': f"{DISCHARGE_CODE},{GAGE_HEIGHT_CODE}",
+        'siteStatus': 'active',
+    }
+    url = USGS_IV_SERVICE_URL + '?' + urllib.parse.urlencode(args, safe=',')
+    with urllib.request.urlopen(url, timeout=120) as response:
+        data = json.load(response)
+
+    series_by_site = {}
+    for series in data.get('value', {}).get('timeSeries', []):
+        try:
+            site_number = series['sourceInfo']['siteCode'][0]['value']
+            code = series['variable']['variableCode'][0]['value']
+            unit = series['variable']['unit']['unitCode']
+            values = series['values'][0]['value']
+        except (KeyError, IndexError):
+            continue
+        series_by_site.setdefault(site_number, {})[code] = {'unit': unit, 'values': values}
+    return series_by_site
+
+def summarize(series, period, today):
+    """
+    Derive the high/low summary for one period from a year of readings.
+
+    Follows get_historical_data(): empty and zero readings are ignored
+    (array_filter), and ties resolve to the latest matching reading.
+
+    Args:
+        series (dict|None): {'unit': str, 'values': list} for one parameter.
+        period (str): The period code.
+        today (date): The end date of the period.
+
+    Returns:
+        dict: high, high_datetime, low, low_datetime and unit (None if no data).
+    """
+    summary = {'high': None, 'high_datetime': None, 'low': None, 'low_datetime': None, 'unit': None}
+    if not series:
+        return summary
+
+    start = period_start_date(period, today).isoformat()
+    readings = []
+    for item in series['values']:
+        if item.get('dateTime', '')[:10] < start or item.get('value', '') == '':
+            continue
+        number = float(item['value'])
+        if number:
+            readings.append((number, item['dateTime']))
+    if not readings:
+        return summary
+
+    summary['high'] = max(number for number, _ in readings)
+    summary['low'] = min(number for number, _ in readings)
+    for number, moment in readings:
+        if number == summary['high']:
+            summary['high_datetime'] = moment
+        if number == summary['low']:
+            summary['low_datetime'] = moment
+    summary['unit'] = series['unit']
+    return summary
+
+def build_snapshot(site, series_by_code, today):
+    """
+    Build the readings payload for one site, as stored in its JSON sidecar.
+
+    Args:
+        site (dict): A site from the usgs_stream_gage_sites option.
+        series_by_code (dict): Readings for this site keyed by parameter code.
+        today (date): The end date of all periods.
+
+    Returns:
+        dict: Site info, current values and per-period summaries.
+    """
+    current = {
+        'timestamp': None,
+        'discharge': None,
+        'discharge_unit': None,
+        'gage_height': None,
+        'gage_height_unit': None,
+    }
+    for code, key in ((DISCHARGE_CODE, 'discharge'), (GAGE_HEIGHT_CODE, 'gage_height')):
+        series = series_by_code.get(code)
+        if series and series['values']:
+            latest = series['values'][-1]
+            current[key] = latest.get('value')
+            current[key + '_unit'] = series['unit']
+            current['timestamp'] = max(filter(None, [current['timestamp'], latest.get('dateTime')]))
+
+    historical = {}
+    for period in PERIODS:
+        historical[period] = {
+            'discharge': summarize(series_by_code.get(DISCHARGE_CODE), period, today),
+            'gage_height': summarize(series_by_code.get(GAGE_HEIGHT_CODE), period, today),
+        }
+
+    return {
+        'id': site['id'],
+        'site_number': site['site_number'],
+        'site_name': site.get('site_name', ''),
+        'current': current,
+        'historical': historical,
+    }
+
+def fingerprint(snapshot):
+    """
+    Hash a snapshot payload so unchanged readings can be detected.
+
+    Args:
+        snapshot (dict): The payload from build_snapshot().
+
+    Returns:
+        str: Hex SHA-256 of the canonical JSON encoding.
+    """
+    canonical = json.dumps(snapshot, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+# --- Rendering ---
+
+def render_historical_row(label, data, display):
+    """
+    Render one measurement row of a historical high/low table.
+
+    Args:
+        label (str): 'Discharge' or 'Gage Height'.
+        data (dict): The summary from summarize().
+        display (dict): Date settings from the snapshot's 'display' entry.
+
+    Returns:
+        str: The <tr> markup.
+    """
+    date_format = f"{display['date_format']} {display['time_format']}"
+    tz = parse_timezone(display['timezone']) if display['timezone'] else None
+    high_datetime = esc(format_datetime(data['high_datetime'], date_format, tz))
+    low_datetime = esc(format_datetime(data['low_datetime'], date_format, tz))
+    return (
+        '<tr>'
+        f'<td data-label="Measurement">{label} ({esc(data["unit"])})</td>'
+        f'<td data-label="High" class="usgs-high">{esc(php_number(data["high"]))}'
+        f'<div class="usgs-datetime">{high_datetime}</div></td>'
+        f'<td data-label="High Date/Time" class="desktop-only">{high_datetime}</td>'
+        f'<td data-label="Low" class="usgs-low">{esc(php_number(data["low"]))}'
+        f'<div class="usgs-datetime">{low_datetime}</div></td>'
+        f'<td data-label="Low Date/Time" class="desktop-only">{low_datetime}</td>'
+        '</tr>'
+    )
+
+def render_snapshot(snapshot):
+    """
+    Render a snapshot with the same markup as render_shortcode() uses.
+
+    Args:
+        snapshot (dict): The payload from build_snapshot().
+
+    Returns:
+        str: The HTML fragment.
+    """
+    site_id = esc(snapshot['id'])
+    current = snapshot['current']
+    display = snapshot['display']
+    tz = parse_timezone(display['timezone']) if display['timezone'] else None
+    out = []
+
+    # Output container and site header
+    out.append(f'<div class="usgs-stream-gage-data" id="usgs-stream-gage-{site_id}">')
+    out.append('<div class="usgs-site-header">')
+    out.append(f'<h3 class="usgs-site-name">{esc(snapshot["site_name"])}</h3>')
+    out.append(f'<div class="usgs-site-number">USGS {esc(snapshot["site_number"])}</div>')
+    out.append('</div>')
+
+    # Current data section
+    out.append('<div class="usgs-current-data">')
+    out.append('<h4>Current Conditions</h4>')
+    out.append(f'<div class="usgs-current-datetime">As of {esc(format_datetime(current["timestamp"], AS_OF_FORMAT, tz))}</div>')
+    out.append('<table class="usgs-data-table">')
+    out.append('<thead><tr><th>Measurement</th><th>Current Value</th></tr></thead>')
+    out.append('<tbody>')
+    for key, label in (('discharge', 'Discharge'), ('gage_height', 'Gage Height')):
+        if not php_empty(current[key]):
+            out.append('<tr>')
+            out.append(f'<td>{label}</td>')
+            out.append(f'<td>{esc(current[key])} {esc(current[key + "_unit"])}</td>')
+            out.append('</tr>')
+    out.append('</tbody>')
+    out.append('</table>')
+    out.append('</div>')
+
+    out.append(RESPONSIVE_STYLE)
+
+    # Historical data section
+    out.append('<div class="usgs-historical-data">')
+    out.append('<h4>Historical High/Low Values</h4>')
+    out.append('<div class="usgs-period-tabs">')
+    for index, period in enumerate(PERIODS):
+        active_class = 'active' if index == 0 else ''
+        out.append(
+            f'<button class="usgs-period-tab {active_class}" data-period="{period}">'
+            f'{PERIOD_LABELS[period]}</button>'
+        )
+    out.append('</div>')
+
+    out.append('<div class="usgs-period-content">')
+    for index, period in enumerate(PERIODS):
+        display_style = 'block' if index == 0 else 'none'
+        period_data = snapshot['historical'][period]
+        out.append(f'<div class="usgs-period-data" data-period="{period}" style="display: {display_style};">')
+        out.append('<table class="usgs-data-table usgs-historical-table">')
+        out.append('<thead><tr><th>Measurement</th><th>High</th><th>Date/Time</th><th>Low</th><th>Date/Time</th></tr></thead>')
+        out.append('<tbody>')
+        if not php_empty(period_data['discharge']['high']):
+            out.append(render_historical_row('Discharge', period_data['discharge'], display))
+        if not php_empty(period_data['gage_height']['high']):
+            out.append(render_historical_row('Gage Height', period_data['gage_height'], display))
+        out.append('</tbody>')
+        out.append('</table>')
+        out.append('</div>')
+    out.append('</div>')
+    out.append('</div>')
+
+    out.append(TAB_SCRIPT.replace('{id}', site_id))
+
+    # Footer with attribution
+    out.append('<div class="usgs-footer">')
+    out.append(
+        f'<a href="https://waterdata.usgs.gov/nwis/uv?site_no={esc(snapshot["site_number"])}" '
+        'target="_blank" rel="noopener noreferrer">View on USGS Water Data</a>'
+    )
+    out.append('</div>')
+
+    out.append('</div>')
+    return ''.join(out)
+
+# --- Core Rendering Class/Logic ---
+
+class SnapshotRenderer:
+    """Fetches readings for all configured sites and writes their snapshots."""
+
+    def __init__(self, sites, output_dir, force=False, display=None):
+        """
+        Initialize the renderer.
+
+        Args:
+            sites (list): Sites from the usgs_stream_gage_sites option.
+            output_dir (str): Directory the .html/.json files are written to.
+            force (bool): Re-render even if the readings have not changed.
+            display (dict): date_format, time_format and timezone settings.
+        """
+        self.sites = [site for site in sites if site.get('id') and site.get('site_number')]
+        self.output_dir = output_dir
+        self.force = force
+        self.display = dict(
+            {'date_format': DEFAULT_DATE_FORMAT, 'time_format': DEFAULT_TIME_FORMAT, 'timezone': None},
+            **(display or {})
+        )
+        self.rendered = []
+        self.unchanged = []
+        self.failed = []
+
+    def stored_fingerprint(self, site_id):
+        """Return the fingerprint of the existing snapshot, or None."""
+        if not os.path.isfile(os.path.join(self.output_dir, f"{site_id}.html")):
+            return None
+        try:
+            with open(os.path.join(self.output_dir, f"{site_id}.json"), 'r', encoding='utf-8') as f:
+                return json.load(f).get('fingerprint')
+        except (OSError, ValueError):
+            return None
+
+    def render(self, today=None):
+        """
+        Fetch all readings in batched requests and write changed snapshots.
+
+        Args:
+            today (date): End date of all periods (defaults to today).
+        """
+        today = today or date.today()
+        site_numbers = sorted({site['site_number'] for site in self.sites})
+
+        series_by_site = {}
+        fetched = set()
+        for start in range(0, len(site_numbers), SITES_PER_REQUEST):
+            chunk = site_numbers[start:start + SITES_PER_REQUEST]
+            try:
+                series_by_site.update(fetch_series(chunk, today))
+                fetched.update(chunk)
+            except (OSError, ValueError) as e:
+                print(f"Error fetching data for sites {', '.join(chunk)}: {e}")
+
+        for site in self.sites:
+            site_id = site['id']
+            # Keep the previous snapshot rather than overwrite it with empty data
+            if site['site_number'] not in fetched or not re.match(r'^[\w-]+$', site_id):
+                self.failed.append(site_id)
+                continue
+
+            snapshot = build_snapshot(site, series_by_site.get(site['site_number'], {}), today)
+            # Part of the fingerprint, so changing a date setting re-renders
+            snapshot['display'] = self.display
+            digest = fingerprint(snapshot)
+            if not self.force and self.stored_fingerprint(site_id) == digest:
+                self.unchanged.append(site_id)
+                continue
+
+            sidecar = dict(snapshot, fingerprint=digest)
+            write_atomic(os.path.join(self.output_dir, f"{site_id}.html"), render_snapshot(snapshot))
+            write_atomic(
+                os.path.join(self.output_dir, f"{site_id}.json"),
+                json.dumps(sidecar, indent=2, sort_keys=True) + "\n"
+            )
+            self.rendered.append(site_id)
+
+# --- Main Execution ---
+
+def main():
+    """Main function to handle script execution and arguments."""
+    parser = argparse.ArgumentParser(
+        description="Pre-render USGS stream gage shortcode output to static files.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument(
+        "-s", "--sites",
+        required=True,
+        help="Path to a JSON export of the usgs_stream_gage_sites option."
+    )
+    parser.add_argument(
+        "-o", "--output",
+        required=True,
+        help="Directory to write the .html and .json snapshots to."
+    )
+    parser.add_argument(
+        "-f", "--force",
+        action="store_true",
+        help="Re-render every site even if its readings have not changed."
+    )
+    parser.add_argument(
+        "--date-format",
+        default=DEFAULT_DATE_FORMAT,
+        help="The site's date_format option (PHP date() format)."
+    )
+    parser.add_argument(
+        "--time-format",
+        default=DEFAULT_TIME_FORMAT,
+        help="The site's time_format option (PHP date() format)."
+    )
+    parser.add_argument(
+        "--timezone",
+        default=None,
+        help="The site's timezone_string or UTC offset (e.g. America/Denver, --timezone=-07:00); "
+             "defaults to each gage's own UTC offset."
+    )
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.sites):
+        print(f"Error: Sites file not found at '{args.sites}'")
+        return 1
+
+    # Fail before fetching anything if the timezone is unknown
+    if args.timezone:
+        try:
+            parse_timezone(args.timezone)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 1
+
+    try:
+        with open(args.sites, 'r', encoding='utf-8') as f:
+            sites = json.load(f)
+        # PHP arrays with non-sequential keys export as JSON objects
+        if isinstance(sites, dict):
+            sites = list(sites.values())
+
+        os.makedirs(args.output, exist_ok=True)
+        display = {
+            'date_format': args.date_format,
+            'time_format': args.time_format,
+            'timezone': args.timezone,
+        }
+        renderer = SnapshotRenderer(sites, args.output, force=args.force, display=display)
+        renderer.render()
+
+        print(
+            f"Rendered {len(renderer.rendered)}, unchanged {len(renderer.unchanged)}, "
+            f"failed {len(renderer.failed)} snapshot(s) in '{args.output}'"
+        )
+        return 1 if renderer.failed else 0
+
+    except ValueError as e:
+        print(f"Error reading sites file '{args.sites}': {e}")
+        return 1
+    except IOError as e:
+        print(f"Error writing snapshots to '{args.output}': {e}")
+        return 1
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+        return 1
+
+if __name__ == "__main__":
+    exit_code = main()
+    exit(exit_code)